@@ -1,11 +1,41 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta, date
-from typing import Dict, List, Tuple, Optional
-from decimal import Decimal
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple, Optional
 import logging
+import os
+import tempfile
 from pathlib import Path
+import hashlib
 import re
+import csv
+import io
+import itertools
+import time
+from functools import lru_cache
+
+try:
+    import polars as pl
+except ImportError:  # Optional multi-threaded CSV reader
+    pl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pv
+except ImportError:  # Optional Arrow-backed columns and block-streaming reader for very large CSVs
+    pa = pv = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # Optional JIT for very large customer counts
+    njit = None
+
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:  # Fall back to pandas' default openpyxl reader
+    EXCEL_ENGINE = None
 
 from .models import (
     SalesRecord, CustomerMapping, DormantCustomer, 
@@ -14,6 +44,99 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# Planning sheet column name patterns
+CUSTOMER_COLUMN_PATTERN = re.compile(r'customer', re.IGNORECASE)
+REP_COLUMN_PATTERN = re.compile(r'rep|salesperson|assigned', re.IGNORECASE)
+
+# Rep shown for customers with neither a planning assignment nor a sales-file salesperson
+UNASSIGNED_REP = 'Unassigned'
+
+# Date layout of the sales export (e.g. 7/22/2024)
+SALES_DATE_FORMAT = '%m/%d/%Y'
+
+# Load sales columns into Arrow buffers (strings as one contiguous buffer, not per-row objects)
+ARROW_DTYPES = {'dtype_backend': 'pyarrow'} if pa is not None else {}
+
+# Cached sales entries unused for this long are deleted when a new entry is written
+SALES_CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+# Part of every cache file name; bump it whenever validate_sales_data changes its output
+SALES_CACHE_VERSION = 2
+
+# Uploads are hashed in 1 MiB chunks
+HASH_CHUNK_SIZE = 1 << 20
+
+# Sales CSVs at least this large are streamed block by block with PyArrow
+CSV_STREAM_MIN_BYTES = 256 << 20
+CSV_STREAM_BLOCK_SIZE = 64 << 20
+
+# Seasonal label for each calendar month (index 0 unused)
+SEASON_BY_MONTH = np.array([
+    None,
+    "Winter buyer", "Winter buyer",
+    "Spring buyer", "Spring buyer", "Spring buyer",
+    "Summer buyer", "Summer buyer", "Summer buyer",
+    "Fall buyer", "Fall buyer", "Fall buyer",
+    "Winter buyer"
+], dtype=object)
+
+# Customer count above which the JIT-compiled churn kernel pays for its compile time
+NUMBA_MIN_CUSTOMERS = 50_000
+
+if njit is not None:
+    # cache=True keeps the compiled kernel on disk, so each worker process skips recompiling
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _churn_risk_kernel_jit(days_since_last_order, order_counts, avg_order_values,
+                               value_trends, analysis_period_months):
+        """Parallel per-customer churn risk, equivalent to AdvancedAnalytics._churn_risk_kernel."""
+        n = days_since_last_order.size
+        risk_scores = np.empty(n)
+        for i in prange(n):
+            recency_score = min(days_since_last_order[i] / 90.0, 1.0)
+            frequency_score = max(1.0 - order_counts[i] / (analysis_period_months * 30.0), 0.0)
+            value_score = max(1.0 - avg_order_values[i] / 1000.0, 0.0)
+            trend_score = max(1.0 - value_trends[i], 0.0)
+            risk_score = (
+                recency_score * 0.4 +
+                frequency_score * 0.3 +
+                value_score * 0.2 +
+                trend_score * 0.1
+            )
+            risk_scores[i] = min(max(risk_score, 0.0), 1.0)
+        return risk_scores
+
+
+def _file_md5(file_path: str) -> str:
+    """MD5 of a file's content, read in chunks so large uploads never sit in memory whole."""
+    digest = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: Path, write: Callable[[str], None]) -> None:
+    """Call write() on a temp file beside path, then rename it into place."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+@lru_cache(maxsize=8)
+def _read_planning_file(content: bytes, is_xlsx: bool) -> pd.DataFrame:
+    """Parse a planning file; cached by content, since every upload lands at a new temp path."""
+    if is_xlsx:
+        # Inspect sheet names once instead of parsing the workbook twice
+        with pd.ExcelFile(io.BytesIO(content), engine=EXCEL_ENGINE) as xl:
+            sheet = 'Planning' if 'Planning' in xl.sheet_names else xl.sheet_names[0]
+            return xl.parse(sheet)
+    return pd.read_csv(io.BytesIO(content))
+
 
 class DataValidator:
     """Advanced data validation and cleaning."""
@@ -24,42 +147,86 @@ class DataValidator:
         initial_count = len(df)
         issues = []
         
-        # Convert dates
+        # Convert dates (already-typed columns, e.g. from the Parquet cache, are kept as-is)
         date_columns = ['Invoice date', 'Posted date']
+        invalid_date_counts = {}
         for col in date_columns:
             if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-                invalid_dates = df[col].isna().sum()
-                if invalid_dates > 0:
-                    issues.append(f"{invalid_dates} invalid dates in {col}")
-        
-        # Clean and validate prices
+                if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                    df[col] = DataValidator._parse_dates(df[col])
+                invalid_date_counts[col] = int(df[col].isna().sum())
+                if invalid_date_counts[col] > 0:
+                    issues.append(f"{invalid_date_counts[col]} invalid dates in {col}")
+        
+        # Clean and validate prices (count before missing prices are zero-filled)
+        invalid_prices = 0
         if 'Net price' in df.columns:
-            df['Net price'] = pd.to_numeric(df['Net price'], errors='coerce')
-            invalid_prices = df['Net price'].isna().sum()
+            df['Net price'] = DataValidator._to_numeric(df['Net price'])
+            invalid_prices = int(df['Net price'].isna().sum())
             if invalid_prices > 0:
                 issues.append(f"{invalid_prices} invalid prices")
             df['Net price'] = df['Net price'].fillna(0)
+            
+            # Store prices as float32 when every value survives to the cent
+            prices_32 = df['Net price'].astype('float32')
+            if np.allclose(prices_32, df['Net price'], rtol=0, atol=0.005):
+                df['Net price'] = prices_32
+        
+        if 'Qty' in df.columns:
+            df['Qty'] = pd.to_numeric(DataValidator._to_numeric(df['Qty']), downcast='integer')
         
         # Remove completely invalid rows
         df_clean = df.dropna(subset=['Posted date', 'Customer'])
-        removed_count = initial_count - len(df_clean)
         
         # Detect duplicates
-        duplicates = df_clean.duplicated().sum()
+        duplicates = int(df_clean.duplicated().sum())
+        
+        # Low-cardinality keys as categoricals so groupbys hash int codes, not strings
+        key_columns = [col for col in ['Customer', 'Salesperson'] if col in df_clean.columns]
+        df_clean = df_clean.astype({col: 'category' for col in key_columns})
+        # Arrow-backed inputs give Arrow categories; store them as plain objects, as the Parquet cache restores them
+        df_clean = df_clean.assign(**{
+            col: df_clean[col].cat.rename_categories(df_clean[col].cat.categories.astype(object))
+            for col in key_columns
+        })
         
         quality_report = DataQualityReport(
             total_records=initial_count,
             valid_records=len(df_clean),
             duplicate_records=duplicates,
             missing_customer_mappings=0,  # Will be updated later
-            invalid_dates=df['Posted date'].isna().sum() if 'Posted date' in df.columns else 0,
-            invalid_prices=df['Net price'].isna().sum() if 'Net price' in df.columns else 0,
+            invalid_dates=invalid_date_counts.get('Posted date', 0),
+            invalid_prices=invalid_prices,
             data_completeness_score=len(df_clean) / initial_count if initial_count > 0 else 0,
             recommendations=issues
         )
         
         return df_clean, quality_report
+    
+    @staticmethod
+    def _to_numeric(values: pd.Series) -> pd.Series:
+        """Coerce to numbers, with every unparseable or missing value as a numpy NaN."""
+        numeric = pd.to_numeric(values, errors='coerce')
+        if isinstance(numeric.dtype, pd.ArrowDtype):
+            # Arrow keeps coerced failures as NaN, distinct from NA, so isna() would miss them
+            numeric = numeric.astype('float64')
+        return numeric
+    
+    @staticmethod
+    def _parse_dates(values: pd.Series) -> pd.Series:
+        """Parse export dates with the pinned format, parsing any stragglers value by value."""
+        parsed = pd.to_datetime(values, format=SALES_DATE_FORMAT, errors='coerce', cache=True)
+        unparsed = parsed.isna() & values.notna()
+        if unparsed.any():
+            # format='mixed' keeps time parts and other layouts without pandas' inference warning
+            parsed[unparsed] = pd.to_datetime(values[unparsed], format='mixed', errors='coerce')
+            rescued = int(parsed[unparsed].notna().sum())
+            if rescued:
+                logger.warning(
+                    f"{rescued} of {len(values)} values in {values.name} did not match "
+                    f"{SALES_DATE_FORMAT}; parsed them individually"
+                )
+        return parsed
 
 
 class AdvancedAnalytics:
@@ -72,26 +239,95 @@ class AdvancedAnalytics:
             return 0.5
         
         # Factors contributing to churn risk
-        days_since_last_order = (config.today_date - customer_data['Posted date'].max().date()).days
-        order_frequency = len(customer_data) / (config.analysis_period_months * 30)
-        avg_order_value = customer_data['Net price'].mean()
+        last_order = np.datetime64(customer_data['Posted date'].max(), 'ns')
+        days_since_last_order = int((config.today_np - last_order) // np.timedelta64(1, 'D'))
         value_trend = AdvancedAnalytics._calculate_value_trend(customer_data)
         
+        risk_score = AdvancedAnalytics._churn_risk_kernel(
+            np.array([days_since_last_order], dtype=float),
+            np.array([len(customer_data)], dtype=float),
+            np.array([customer_data['Net price'].mean()], dtype=float),
+            np.array([value_trend], dtype=float),
+            config.analysis_period_months
+        )
+        
+        return float(risk_score[0])
+    
+    @staticmethod
+    def calculate_churn_risk_scores_vec(customer_stats: pd.DataFrame, config: AnalyticsConfig) -> np.ndarray:
+        """Calculate churn risk scores for all customers in one vectorized pass.
+        
+        Expects one row per customer with last_date, order_count,
+        avg_order_value and value_trend columns.
+        """
+        days_since_last_order = (config.today_np - customer_stats['last_date'].to_numpy()).astype('timedelta64[D]')
+        
+        return AdvancedAnalytics._churn_risk_kernel(
+            days_since_last_order.astype(float),
+            customer_stats['order_count'].to_numpy(dtype=float),
+            customer_stats['avg_order_value'].to_numpy(dtype=float),
+            customer_stats['value_trend'].to_numpy(dtype=float),
+            config.analysis_period_months
+        )
+    
+    @staticmethod
+    def _churn_risk_kernel(days_since_last_order: np.ndarray, order_counts: np.ndarray,
+                           avg_order_values: np.ndarray, value_trends: np.ndarray,
+                           analysis_period_months: int) -> np.ndarray:
+        """Weighted churn risk over per-customer factor arrays."""
+        if njit is not None and days_since_last_order.size >= NUMBA_MIN_CUSTOMERS:
+            return _churn_risk_kernel_jit(
+                days_since_last_order, order_counts, avg_order_values, value_trends, analysis_period_months
+            )
+        
+        order_frequency = order_counts / (analysis_period_months * 30)
+        
         # Normalize factors (0-1 scale)
-        recency_score = min(days_since_last_order / 90, 1.0)  # Higher = worse
-        frequency_score = max(1 - order_frequency, 0)  # Lower frequency = higher risk
-        value_score = max(1 - (avg_order_value / 1000), 0)  # Lower value = higher risk
-        trend_score = max(1 - value_trend, 0)  # Declining trend = higher risk
+        recency_score = np.minimum(days_since_last_order / 90, 1.0)  # Higher = worse
+        frequency_score = np.maximum(1 - order_frequency, 0)  # Lower frequency = higher risk
+        value_score = np.maximum(1 - avg_order_values / 1000, 0)  # Lower value = higher risk
+        trend_score = np.maximum(1 - value_trends, 0)  # Declining trend = higher risk
         
         # Weighted average
-        risk_score = (
+        risk_scores = (
             recency_score * 0.4 +
             frequency_score * 0.3 +
             value_score * 0.2 +
             trend_score * 0.1
         )
         
-        return min(max(risk_score, 0), 1)
+        return np.clip(risk_scores, 0, 1)
+    
+    @staticmethod
+    def calculate_value_trends(sales_data: pd.DataFrame) -> pd.Series:
+        """Calculate spending trend for every customer at once.
+        
+        Fits the same least-squares slope as _calculate_value_trend over each
+        customer's monthly spending, using closed-form sums instead of polyfit.
+        """
+        monthly = sales_data.groupby(
+            [sales_data['Customer'], AdvancedAnalytics._month_key(sales_data['Posted date'])], observed=True
+        )['Net price'].agg(['sum', 'size'])
+        
+        # x is the position of each month within its customer's history
+        x = monthly.groupby(level='Customer', observed=True).cumcount().to_numpy(dtype=float)
+        y = monthly['sum'].to_numpy(dtype=float)
+        sums = pd.DataFrame(
+            {'rows': monthly['size'].to_numpy(), 'n': 1, 'x': x, 'y': y, 'xy': x * y, 'xx': x * x},
+            index=monthly.index.get_level_values('Customer')
+        ).groupby(level='Customer', sort=False, observed=True).sum()
+        
+        n = sums['n'].to_numpy(dtype=float)
+        sum_x = sums['x'].to_numpy()
+        sum_y = sums['y'].to_numpy()
+        mean_y = sum_y / n
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = (n * sums['xy'].to_numpy() - sum_x * sum_y) / (n * sums['xx'].to_numpy() - sum_x ** 2)
+            trend = np.clip(slope / mean_y + 0.5, 0, 1)
+        
+        has_trend = (sums['rows'].to_numpy() >= 3) & (n >= 2) & (mean_y != 0)
+        return pd.Series(np.where(has_trend, trend, 0.5), index=sums.index)
     
     @staticmethod
     def _calculate_value_trend(customer_data: pd.DataFrame) -> float:
@@ -100,27 +336,34 @@ class AdvancedAnalytics:
             return 0.5
         
         monthly_spending = customer_data.groupby(
-            customer_data['Posted date'].dt.to_period('M')
+            AdvancedAnalytics._month_key(customer_data['Posted date'])
         )['Net price'].sum().sort_index()
         
         if len(monthly_spending) < 2:
             return 0.5
         
-        # Simple trend calculation
-        x = np.arange(len(monthly_spending))
-        y = monthly_spending.values
+        y = monthly_spending.to_numpy(dtype=float)
+        n = y.size
+        mean_y = y.mean()
+        if mean_y == 0:
+            return 0.5
         
-        if len(x) >= 2:
-            slope = np.polyfit(x, y, 1)[0]
-            return max(min(slope / np.mean(y) + 0.5, 1), 0)
+        # Closed-form least-squares slope over x = 0..n-1
+        x_centered = np.arange(n) - (n - 1) / 2
+        slope = (x_centered * (y - mean_y)).sum() / (n * (n * n - 1) / 12)
         
-        return 0.5
+        return float(max(min(slope / mean_y + 0.5, 1), 0))
     
     @staticmethod
-    def calculate_customer_lifetime_value(customer_data: pd.DataFrame) -> Decimal:
-        """Calculate estimated customer lifetime value."""
+    def _month_key(dates: pd.Series) -> np.ndarray:
+        """Integer year * 12 + month key, cheaper to group on than monthly periods."""
+        return dates.dt.year.to_numpy() * 12 + dates.dt.month.to_numpy()
+    
+    @staticmethod
+    def calculate_customer_lifetime_value(customer_data: pd.DataFrame) -> float:
+        """Calculate estimated customer lifetime value, rounded to cents."""
         if customer_data.empty:
-            return Decimal('0')
+            return 0.0
         
         total_spent = customer_data['Net price'].sum()
         order_count = len(customer_data)
@@ -131,7 +374,15 @@ class AdvancedAnalytics:
         estimated_annual_orders = max(order_count * 2, 6)  # Conservative estimate
         clv = avg_order_value * estimated_annual_orders
         
-        return Decimal(str(round(clv, 2)))
+        return round(float(clv), 2)
+    
+    @staticmethod
+    def calculate_customer_lifetime_values_vec(customer_stats: pd.DataFrame) -> np.ndarray:
+        """Calculate estimated lifetime value for every customer in an aggregate frame."""
+        order_counts = customer_stats['order_count'].to_numpy()
+        estimated_annual_orders = np.maximum(order_counts * 2, 6)  # Conservative estimate
+        
+        return np.round(customer_stats['avg_order_value'].to_numpy(dtype=float) * estimated_annual_orders, 2)
     
     @staticmethod
     def identify_seasonal_patterns(customer_data: pd.DataFrame) -> Optional[str]:
@@ -148,43 +399,43 @@ class AdvancedAnalytics:
         
         peak_month = monthly_orders.idxmax()
         
-        seasonal_map = {
-            (12, 1, 2): "Winter",
-            (3, 4, 5): "Spring", 
-            (6, 7, 8): "Summer",
-            (9, 10, 11): "Fall"
-        }
+        return SEASON_BY_MONTH[peak_month] or "No clear pattern"
+    
+    @staticmethod
+    def identify_seasonal_patterns_vec(sales_data: pd.DataFrame) -> pd.Series:
+        """Identify seasonal purchasing patterns for every customer at once."""
+        month_counts = sales_data.groupby(
+            ['Customer', sales_data['Posted date'].dt.month], observed=True
+        ).size().unstack(fill_value=0)
         
-        for months, season in seasonal_map.items():
-            if peak_month in months:
-                return f"{season} buyer"
+        peak_months = month_counts.idxmax(axis=1).to_numpy(dtype=int)
+        patterns = pd.Series(SEASON_BY_MONTH[peak_months], index=month_counts.index)
+        patterns[month_counts.sum(axis=1) < 6] = None
         
-        return "No clear pattern"
+        return patterns
 
 
 class DormantCustomerProcessor:
     """Main processor for dormant customer analysis."""
     
-    def __init__(self, config: AnalyticsConfig = None):
+    def __init__(self, config: AnalyticsConfig = None, cache_dir: Optional[str] = None):
         self.config = config or AnalyticsConfig()
         self.validator = DataValidator()
         self.analytics = AdvancedAnalytics()
+        self.cache_dir = cache_dir
     
     def process_files(self, sales_file_path: str, planning_file_path: str) -> ProcessingResult:
         """Process sales and planning files to generate dormant customer report."""
         try:
-            # Load and validate data
-            sales_df = self._load_sales_data(sales_file_path)
+            # Load, validate and clean sales data
+            sales_df_clean, quality_report = self._cached_load(sales_file_path)
             planning_df = self._load_planning_data(planning_file_path)
             
-            # Validate and clean sales data
-            sales_df_clean, quality_report = self.validator.validate_sales_data(sales_df)
-            
             # Apply customer-rep mappings
             sales_df_mapped = self._apply_customer_mappings(sales_df_clean, planning_df)
             
             # Update quality report with mapping info
-            unmapped_customers = sales_df_mapped['Salesperson'].isna().sum()
+            unmapped_customers = int((sales_df_mapped['Salesperson'] == UNASSIGNED_REP).sum())
             quality_report.missing_customer_mappings = unmapped_customers
             
             # Identify dormant customers
@@ -197,19 +448,27 @@ class DormantCustomerProcessor:
             # Calculate data accuracy score
             accuracy_score = self._calculate_accuracy_score(quality_report)
             
+            # Categories are exactly the customers left after validation, so no rescan is needed
+            customers = sales_df_mapped['Customer']
+            if isinstance(customers.dtype, pd.CategoricalDtype):
+                total_customers = len(customers.cat.categories)
+            else:
+                total_customers = customers.nunique()
+            
             return ProcessingResult(
                 summary={
                     "total_dormant_customers": len(dormant_customers),
-                    "total_value_at_risk": sum(dc.total_6_month_value for dc in dormant_customers),
+                    "total_value_at_risk": float(np.fromiter((dc.total_6_month_value for dc in dormant_customers), dtype=float).sum()),
                     "average_churn_risk": np.mean([dc.churn_risk_score for dc in dormant_customers]) if dormant_customers else 0,
-                    "data_quality_score": accuracy_score
+                    "data_quality_score": accuracy_score,
+                    **self._summarize_rep_performance(salesperson_summaries)
                 },
                 salesperson_summaries=salesperson_summaries,
                 dormant_customers=dormant_customers,
                 insights=insights,
                 data_quality_report=quality_report.__dict__,
                 processing_timestamp=datetime.now(),
-                total_customers_analyzed=sales_df_mapped['Customer'].nunique(),
+                total_customers_analyzed=total_customers,
                 data_accuracy_score=accuracy_score
             )
             
@@ -217,143 +476,283 @@ class DormantCustomerProcessor:
             logger.error(f"Processing failed: {str(e)}")
             raise
     
+    def _cached_load(self, file_path: str) -> Tuple[pd.DataFrame, DataQualityReport]:
+        """Load and validate sales data, reusing a Parquet cache keyed by file content."""
+        if not self.cache_dir:
+            return self.validator.validate_sales_data(self._load_sales_data(file_path))
+        
+        cache_path = Path(self.cache_dir) / f"{_file_md5(file_path)}-v{SALES_CACHE_VERSION}.parquet"
+        report_path = cache_path.with_suffix('.json')
+        
+        # The report is written first, so a Parquet file means a complete entry
+        if cache_path.exists():
+            try:
+                sales_df_clean = pd.read_parquet(cache_path)
+                quality_report = DataQualityReport.model_validate_json(report_path.read_text())
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable sales cache {cache_path}: {str(e)}")
+            else:
+                logger.info(f"Loaded validated sales data from cache: {cache_path}")
+                # Refresh the mtime so eviction goes by last use, not first write
+                cache_path.touch()
+                return sales_df_clean, quality_report
+        
+        sales_df_clean, quality_report = self.validator.validate_sales_data(self._load_sales_data(file_path))
+        
+        # Write through temp files so concurrent workers never read a partial entry
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomic(report_path, lambda tmp: Path(tmp).write_text(quality_report.model_dump_json()))
+            _write_atomic(cache_path, lambda tmp: sales_df_clean.to_parquet(tmp, compression='zstd'))
+        except Exception as e:
+            logger.warning(f"Could not cache sales data: {str(e)}")
+        
+        self._evict_stale_cache(cache_path.parent)
+        return sales_df_clean, quality_report
+    
+    @staticmethod
+    def _evict_stale_cache(cache_dir: Path) -> None:
+        """Delete cached sales entries not used within SALES_CACHE_MAX_AGE_SECONDS."""
+        cutoff = time.time() - SALES_CACHE_MAX_AGE_SECONDS
+        # Temp files are only left behind by writers that died mid-write
+        for cached in itertools.chain(cache_dir.glob('*.parquet'), cache_dir.glob('*.tmp')):
+            try:
+                if cached.stat().st_mtime < cutoff:
+                    cached.unlink()
+                    if cached.suffix == '.parquet':
+                        cached.with_suffix('.json').unlink(missing_ok=True)
+            except OSError as e:  # Another worker may have evicted it first
+                logger.debug(f"Could not evict cached sales data {cached}: {str(e)}")
+    
     def _load_sales_data(self, file_path: str) -> pd.DataFrame:
         """Load and preprocess sales data."""
         if file_path.endswith('.csv'):
             # Skip the header rows that aren't part of the data
-            df = pd.read_csv(file_path, skiprows=2)
+            if pa is not None and Path(file_path).stat().st_size >= CSV_STREAM_MIN_BYTES:
+                try:
+                    return self._stream_sales_csv(file_path)
+                except pa.ArrowInvalid as e:
+                    logger.warning(f"Streaming CSV load failed, falling back: {str(e)}")
+            if pl is not None:
+                try:
+                    return pl.read_csv(file_path, skip_rows=2, infer_schema_length=None).to_pandas(
+                        use_pyarrow_extension_array=pa is not None
+                    )
+                except pl.exceptions.PolarsError as e:
+                    logger.warning(f"Polars CSV load failed, falling back to pandas: {str(e)}")
+            # Map the file instead of copying it through read() buffers; polars maps paths itself
+            df = pd.read_csv(file_path, skiprows=2, low_memory=False, memory_map=True, **ARROW_DTYPES)
         else:
-            df = pd.read_excel(file_path)
+            df = pd.read_excel(file_path, engine=EXCEL_ENGINE, **ARROW_DTYPES)
         
         return df
     
+    def _stream_sales_csv(self, file_path: str) -> pd.DataFrame:
+        """Read a large sales CSV in fixed-size blocks with PyArrow.
+        
+        Every column is read as text so a later block can't contradict the
+        types inferred from the first one; the validator coerces the columns
+        it uses. Key string columns are dictionary-encoded per block, so the
+        assembled table holds each customer and salesperson name once.
+        """
+        with open(file_path, newline='') as f:
+            header = next(itertools.islice(csv.reader(f), 2, None))
+        
+        reader = pv.open_csv(
+            file_path,
+            read_options=pv.ReadOptions(skip_rows=2, block_size=CSV_STREAM_BLOCK_SIZE),
+            # Notes fields may contain quoted line breaks
+            parse_options=pv.ParseOptions(newlines_in_values=True),
+            convert_options=pv.ConvertOptions(
+                column_types={col: pa.string() for col in header},
+                strings_can_be_null=True
+            )
+        )
+        key_columns = [col for col in ['Customer', 'Salesperson'] if col in reader.schema.names]
+        
+        batches = []
+        for batch in reader:
+            columns = [
+                pc.dictionary_encode(column) if name in key_columns else column
+                for name, column in zip(batch.schema.names, batch.columns)
+            ]
+            batches.append(pa.RecordBatch.from_arrays(columns, names=batch.schema.names))
+        
+        if not batches:
+            return reader.schema.empty_table().to_pandas()
+        table = pa.Table.from_batches(batches).unify_dictionaries()
+        
+        # Restore numeric columns now that every block has been seen
+        for i, name in enumerate(table.schema.names):
+            if name in key_columns:
+                continue
+            for numeric_type in (pa.int64(), pa.float64()):
+                try:
+                    table = table.set_column(i, name, table.column(name).cast(numeric_type))
+                    break
+                except pa.ArrowInvalid:
+                    continue
+        
+        return table.to_pandas()
+    
     def _load_planning_data(self, file_path: str) -> pd.DataFrame:
         """Load planning data with customer mappings."""
-        if file_path.endswith('.xlsx'):
-            # Try different sheet names
-            try:
-                df = pd.read_excel(file_path, sheet_name='Planning')
-            except:
-                df = pd.read_excel(file_path, sheet_name=0)
-        else:
-            df = pd.read_csv(file_path)
-        
-        return df
+        # Planning sheets are small, so their bytes serve as the cache key
+        content = Path(file_path).read_bytes()
+        # Copy so callers can't modify the cached frame
+        return _read_planning_file(content, file_path.endswith('.xlsx')).copy()
     
     def _apply_customer_mappings(self, sales_df: pd.DataFrame, planning_df: pd.DataFrame) -> pd.DataFrame:
         """Apply correct customer-to-salesperson mappings."""
-        # Create mapping dictionary
-        customer_mapping = {}
-        
-        # Try different column name variations
-        customer_col = None
-        rep_col = None
-        
-        for col in planning_df.columns:
-            if 'customer' in col.lower():
-                customer_col = col
-            elif 'rep' in col.lower() or 'salesperson' in col.lower() or 'assigned' in col.lower():
-                rep_col = col
+        # Try different column name variations (last match wins)
+        customer_cols = [col for col in planning_df.columns if CUSTOMER_COLUMN_PATTERN.search(str(col))]
+        rep_cols = [
+            col for col in planning_df.columns
+            if col not in customer_cols and REP_COLUMN_PATTERN.search(str(col))
+        ]
+        
+        # Apply mappings on a shallow copy so the caller's frame is untouched
+        sales_df = sales_df.copy(deep=False)
+        sales_df['Salesperson_Original'] = sales_df['Salesperson']
         
-        if customer_col and rep_col:
-            customer_mapping = dict(zip(planning_df[customer_col], planning_df[rep_col]))
+        # Fill on object dtype; categorical fills reject reps outside the existing categories
+        salesperson = sales_df['Salesperson'].astype(object)
+        if customer_cols and rep_cols:
+            customer_mapping = pd.Series(
+                planning_df[rep_cols[-1]].to_numpy(),
+                index=planning_df[customer_cols[-1]].to_numpy()
+            )
+            customer_mapping = customer_mapping[~customer_mapping.index.duplicated(keep='last')]
+            
+            assigned_reps = sales_df['Customer'].map(customer_mapping).astype(object)
+            salesperson = assigned_reps.fillna(salesperson)
         
-        # Apply mappings
-        sales_df = sales_df.copy()
-        sales_df['Salesperson_Original'] = sales_df['Salesperson']
-        sales_df['Salesperson'] = sales_df['Customer'].map(customer_mapping).fillna(sales_df['Salesperson'])
+        # An explicit label keeps unmapped customers in rep summaries, JSON and Excel alike
+        salesperson = salesperson.fillna(UNASSIGNED_REP)
+        if isinstance(sales_df['Salesperson'].dtype, pd.CategoricalDtype):
+            salesperson = salesperson.astype('category')
+        sales_df['Salesperson'] = salesperson
         
         return sales_df
     
     def _identify_dormant_customers(self, sales_df: pd.DataFrame) -> List[DormantCustomer]:
         """Identify and analyze dormant customers."""
-        cutoff_date = self.config.today_date - timedelta(days=self.config.dormant_days_threshold)
-        analysis_start = self.config.today_date - timedelta(days=self.config.analysis_period_months * 30)
+        # Thresholds as datetime64 scalars so comparisons stay in the native datetime kernel
+        today = self.config.today_np
+        cutoff_date = self.config.dormant_cutoff_np
+        analysis_start = self.config.analysis_start_np
         
         # Filter for analysis period
         period_sales = sales_df[sales_df['Posted date'] >= analysis_start]
-        
-        # Find last order date for each customer
-        customer_last_orders = period_sales.groupby('Customer')['Posted date'].max().reset_index()
-        customer_last_orders['last_order_date'] = customer_last_orders['Posted date'].dt.date
+        if period_sales.empty:
+            return []
+        
+        # Prices may be stored as float32; aggregate money in float64
+        period_sales = period_sales.astype({'Net price': 'float64'})
+        
+        # Aggregate every customer in a single pass
+        customer_stats = period_sales.groupby('Customer', sort=False, observed=True).agg(
+            last_date=('Posted date', 'max'),
+            total_value=('Net price', 'sum'),
+            order_count=('Net price', 'size'),
+            salesperson=('Salesperson', 'first')
+        )
+        customer_stats['total_value'] = customer_stats['total_value'].round(2)
+        customer_stats['avg_order_value'] = customer_stats['total_value'] / customer_stats['order_count']
         
         # Identify dormant customers (ordered in period but not recently)
         dormant_mask = (
-            (customer_last_orders['Posted date'] >= analysis_start) &
-            (customer_last_orders['Posted date'] < cutoff_date)
+            (customer_stats['last_date'] >= analysis_start) &
+            (customer_stats['last_date'] < cutoff_date)
+        )
+        dormant_stats = customer_stats[dormant_mask].copy()
+        if dormant_stats.empty:
+            return []
+        
+        # Per-customer analytics only need the dormant customers' rows
+        dormant_sales = period_sales[period_sales['Customer'].isin(dormant_stats.index)]
+        dormant_stats['value_trend'] = self.analytics.calculate_value_trends(dormant_sales).reindex(dormant_stats.index)
+        dormant_stats['seasonal_pattern'] = self.analytics.identify_seasonal_patterns_vec(dormant_sales).reindex(dormant_stats.index)
+        churn_risks = self.analytics.calculate_churn_risk_scores_vec(dormant_stats, self.config)
+        lifetime_values = self.analytics.calculate_customer_lifetime_values_vec(dormant_stats)
+        
+        # Get preferred products (top 3 by quantity) for all customers at once
+        product_qty = (
+            dormant_sales.groupby(['Customer', 'Item'], observed=True)['Qty'].sum()
+            .reset_index()
+            .sort_values(['Customer', 'Qty'], ascending=[True, False])
+        )
+        product_prefs = (
+            product_qty.groupby('Customer', observed=True).head(3)
+            .groupby('Customer', observed=True)['Item'].apply(list)
+            .to_dict()
         )
-        dormant_customer_names = customer_last_orders[dormant_mask]['Customer'].tolist()
         
-        dormant_customers = []
-        for customer in dormant_customer_names:
-            customer_data = period_sales[period_sales['Customer'] == customer]
-            
-            if customer_data.empty:
-                continue
-            
-            # Calculate analytics
-            churn_risk = self.analytics.calculate_churn_risk_score(customer_data, self.config)
-            clv = self.analytics.calculate_customer_lifetime_value(customer_data)
-            seasonal_pattern = self.analytics.identify_seasonal_patterns(customer_data)
-            
-            # Get preferred products (top 3 by quantity)
-            product_prefs = customer_data.groupby('Item')['Qty'].sum().nlargest(3).index.tolist()
-            
-            dormant_customer = DormantCustomer(
-                customer=customer,
-                salesperson=customer_data['Salesperson'].iloc[0],
-                last_order_date=customer_data['Posted date'].max().date(),
-                days_since_order=(self.config.today_date - customer_data['Posted date'].max().date()).days,
-                total_6_month_value=Decimal(str(customer_data['Net price'].sum())),
-                order_count_6_months=len(customer_data),
-                average_order_value=Decimal(str(customer_data['Net price'].mean())),
-                churn_risk_score=churn_risk,
-                customer_lifetime_value=clv,
-                preferred_products=product_prefs,
-                seasonal_pattern=seasonal_pattern
-            )
-            
-            dormant_customers.append(dormant_customer)
+        # Build result objects by keyword from plain per-column lists; values are already typed above
+        customers = dormant_stats.index.tolist()
+        columns = {
+            'customer': customers,
+            'salesperson': dormant_stats['salesperson'].tolist(),
+            'last_order_date': dormant_stats['last_date'].dt.date.tolist(),
+            'days_since_order': (
+                (today - dormant_stats['last_date'].to_numpy()).astype('timedelta64[D]').astype(np.int32).tolist()
+            ),
+            'total_6_month_value': dormant_stats['total_value'].tolist(),
+            'order_count_6_months': dormant_stats['order_count'].tolist(),
+            'average_order_value': dormant_stats['avg_order_value'].tolist(),
+            'churn_risk_score': churn_risks.tolist(),
+            'customer_lifetime_value': lifetime_values.tolist(),
+            'preferred_products': [product_prefs.get(customer, []) for customer in customers],
+            'seasonal_pattern': dormant_stats['seasonal_pattern'].tolist()
+        }
+        
+        dormant_customers = [
+            DormantCustomer(**dict(zip(columns, values)))
+            for values in zip(*columns.values())
+        ]
         
         return dormant_customers
     
     def _generate_salesperson_summaries(self, dormant_customers: List[DormantCustomer]) -> List[SalespersonSummary]:
-        """Generate summary statistics by salesperson."""
-        rep_data = {}
-        
-        for customer in dormant_customers:
-            rep = customer.salesperson
-            if rep not in rep_data:
-                rep_data[rep] = {
-                    'customers': [],
-                    'total_value': Decimal('0'),
-                    'high_value_count': 0,
-                    'quick_win_count': 0,
-                    'risk_scores': []
-                }
-            
-            rep_data[rep]['customers'].append(customer)
-            rep_data[rep]['total_value'] += customer.total_6_month_value
-            rep_data[rep]['risk_scores'].append(customer.churn_risk_score)
-            
-            if customer.total_6_month_value >= self.config.high_value_threshold:
-                rep_data[rep]['high_value_count'] += 1
-            elif customer.total_6_month_value <= self.config.quick_win_threshold:
-                rep_data[rep]['quick_win_count'] += 1
-        
-        summaries = []
-        for rep, data in rep_data.items():
-            summary = SalespersonSummary(
-                salesperson=rep,
-                dormant_customer_count=len(data['customers']),
-                total_value_at_risk=data['total_value'],
-                high_value_dormant_count=data['high_value_count'],
-                quick_win_count=data['quick_win_count'],
-                average_churn_risk=np.mean(data['risk_scores']) if data['risk_scores'] else 0
-            )
-            summaries.append(summary)
+        """Generate summary statistics by salesperson, highest value at risk first."""
+        if not dormant_customers:
+            return []
+        
+        customers_df = pd.DataFrame({
+            'salesperson': [c.salesperson for c in dormant_customers],
+            'value': [c.total_6_month_value for c in dormant_customers],
+            'churn_risk': [c.churn_risk_score for c in dormant_customers]
+        })
+        customers_df['high_value'] = customers_df['value'] >= float(self.config.high_value_threshold)
+        customers_df['quick_win'] = ~customers_df['high_value'] & (customers_df['value'] <= float(self.config.quick_win_threshold))
+        
+        rep_stats = customers_df.groupby('salesperson', sort=False).agg(
+            dormant_customer_count=('value', 'size'),
+            total_value_at_risk=('value', 'sum'),
+            high_value_dormant_count=('high_value', 'sum'),
+            quick_win_count=('quick_win', 'sum'),
+            average_churn_risk=('churn_risk', 'mean')
+        )
+        rep_stats['total_value_at_risk'] = rep_stats['total_value_at_risk'].round(2)
+        rep_stats = rep_stats.sort_values('total_value_at_risk', ascending=False, kind='stable')
         
-        return sorted(summaries, key=lambda x: x.total_value_at_risk, reverse=True)
+        return [
+            SalespersonSummary(salesperson=rep, **stats)
+            for rep, stats in zip(rep_stats.index, rep_stats.to_dict('records'))
+        ]
+    
+    def _summarize_rep_performance(self, summaries: List[SalespersonSummary]) -> Dict[str, Any]:
+        """Rep-level aggregates, computed once so API requests don't rescan the summaries."""
+        if not summaries:
+            return {}
+        
+        return {
+            "total_value_at_risk_total": float(sum(s.total_value_at_risk for s in summaries)),
+            "average_dormant_customers_per_rep": sum(s.dormant_customer_count for s in summaries) / len(summaries),
+            # Summaries are sorted by value at risk, descending
+            "top_performer": summaries[0].salesperson,
+            "needs_attention": [s.salesperson for s in summaries if s.average_churn_risk > 0.7][:3]
+        }
     
     def _generate_insights(self, dormant_customers: List[DormantCustomer], 
                           summaries: List[SalespersonSummary]) -> Dict[str, str]:
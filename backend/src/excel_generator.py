@@ -1,9 +1,16 @@
 import pandas as pd
+import numpy as np
 from openpyxl import Workbook
+from openpyxl.cell import Cell, WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.chart import BarChart, Reference
-from typing import Dict, List
+from openpyxl.formatting.rule import FormulaRule
+from typing import Dict, List, Optional
+from copy import copy
+from dataclasses import fields
+from functools import lru_cache
 import logging
 from datetime import datetime
 
@@ -11,17 +18,41 @@ from .models import ProcessingResult, DormantCustomer, SalespersonSummary
 
 logger = logging.getLogger(__name__)
 
+# Uniformly formatted columns get a fixed width instead of being measured
+CURRENCY_WIDTH = len('$1,234,567.89')
+DATE_WIDTH = len('mm/dd/yyyy')
+PERCENT_WIDTH = len('100.0%')
+
+# Excel number formats, so values are written raw and rendered by Excel
+MONEY_FORMAT = '"$"#,##0.00'
+PERCENT_FORMAT = '0.0%'
+DATE_FORMAT = 'mm/dd/yyyy'
+
+# Plain numeric columns are sized from the leading data rows only
+WIDTH_SAMPLE_ROWS = 500
+
+
+@lru_cache(maxsize=None)
+def _make_fill(argb: str) -> PatternFill:
+    """Solid fill for an 8-digit ARGB colour; styles are immutable, so one instance is shared."""
+    return PatternFill(start_color=argb, end_color=argb, fill_type="solid")
+
 
 class ExcelReportGenerator:
     """Advanced Excel report generator with formatting and charts."""
     
     def __init__(self):
-        self.header_font = Font(bold=True, size=12, color="FFFFFF")
-        self.header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        self.title_font = Font(bold=True, size=14, color="2F5597")
+        self.header_font = Font(bold=True, size=12, color="FFFFFFFF")
+        self.header_fill = _make_fill("FF366092")
+        self.title_font = Font(bold=True, size=14, color="FF2F5597")
         self.subtitle_font = Font(bold=True, size=11)
-        self.highlight_fill = PatternFill(start_color="FFE6CC", end_color="FFE6CC", fill_type="solid")
-        self.warning_fill = PatternFill(start_color="FFD7D7", end_color="FFD7D7", fill_type="solid")
+        self.company_font = Font(bold=True, size=16, color="FF8D4004")
+        self.dashboard_title_font = Font(bold=True, size=16, color="FF2F5597")
+        self.timestamp_font = Font(size=10, italic=True)
+        self.center_align = Alignment(horizontal='center')
+        self.wrap_align = Alignment(wrap_text=True)
+        self.highlight_fill = _make_fill("FFFFE6CC")
+        self.warning_fill = _make_fill("FFFFD7D7")
         self.border = Border(
             left=Side(style='thin'),
             right=Side(style='thin'), 
@@ -31,16 +62,20 @@ class ExcelReportGenerator:
     
     def generate_report(self, result: ProcessingResult, output_path: str) -> str:
         """Generate comprehensive Excel report."""
-        wb = Workbook()
+        # Write-only mode streams each row to disk instead of keeping every cell alive
+        wb = Workbook(write_only=True)
         
-        # Remove default sheet
-        wb.remove(wb.active)
+        # Materialize customers once so sheets can group and sort without per-model attribute access
+        customers_df = pd.DataFrame(
+            [customer.dict() for customer in result.dormant_customers],
+            columns=[field.name for field in fields(DormantCustomer)]
+        )
         
         # Create sheets
         self._create_summary_sheet(wb, result)
-        self._create_salesperson_sheets(wb, result)
-        self._create_consolidated_sheet(wb, result)
-        self._create_analytics_dashboard(wb, result)
+        self._create_salesperson_sheets(wb, result, customers_df)
+        self._create_consolidated_sheet(wb, result, customers_df)
+        self._create_analytics_dashboard(wb, result, customers_df)
         
         # Save workbook
         wb.save(output_path)
@@ -51,18 +86,20 @@ class ExcelReportGenerator:
     def _create_summary_sheet(self, wb: Workbook, result: ProcessingResult):
         """Create executive summary sheet."""
         ws = wb.create_sheet("Executive Summary", 0)
+        rows = []
+        widths = {}
         
         # Title
-        ws['A1'] = "Well Crafted Wine & Beverage Co."
-        ws['A1'].font = Font(bold=True, size=16, color="8D4004")
-        ws['A2'] = "Dormant Customer Analysis Report"
-        ws['A2'].font = Font(bold=True, size=14, color="2F5597")
-        ws['A3'] = f"Generated: {result.processing_timestamp.strftime('%B %d, %Y at %I:%M %p')}"
-        ws['A3'].font = Font(size=10, italic=True)
+        generated = f"Generated: {result.processing_timestamp.strftime('%B %d, %Y at %I:%M %p')}"
+        rows.append([self._cell(ws, "Well Crafted Wine & Beverage Co.", font=self.company_font)])
+        rows.append([self._cell(ws, "Dormant Customer Analysis Report", font=self.title_font)])
+        rows.append([self._cell(ws, generated, font=self.timestamp_font)])
+        rows.append([])
+        self._track_widths(widths, ["Well Crafted Wine & Beverage Co."])
+        self._track_widths(widths, [generated])
         
         # Key Metrics
-        ws['A5'] = "📊 KEY METRICS"
-        ws['A5'].font = self.title_font
+        rows.append([self._cell(ws, "📊 KEY METRICS", font=self.title_font)])
         
         metrics = [
             ("Total Dormant Customers", len(result.dormant_customers)),
@@ -72,39 +109,35 @@ class ExcelReportGenerator:
             ("Customers Analyzed", result.total_customers_analyzed)
         ]
         
-        for i, (metric, value) in enumerate(metrics, 6):
-            ws[f'A{i}'] = metric
-            ws[f'B{i}'] = value
-            ws[f'A{i}'].font = self.subtitle_font
+        for metric, value in metrics:
+            rows.append([self._cell(ws, metric, font=self.subtitle_font), value])
+            self._track_widths(widths, [metric, value])
+        rows.append([])
         
         # AI Strategic Insights
-        ws['A12'] = "🎯 AI-POWERED STRATEGIC INSIGHTS"
-        ws['A12'].font = self.title_font
+        rows.append([self._cell(ws, "🎯 AI-POWERED STRATEGIC INSIGHTS", font=self.title_font)])
+        self._track_widths(widths, ["🎯 AI-POWERED STRATEGIC INSIGHTS"])
         
-        row = 13
         for key, insight in result.insights.items():
-            ws[f'A{row}'] = f"• {insight}"
-            ws[f'A{row}'].alignment = Alignment(wrap_text=True)
-            ws.row_dimensions[row].height = 30
-            row += 1
+            rows.append([self._cell(ws, f"• {insight}", alignment=self.wrap_align)])
+            ws.row_dimensions[len(rows)].height = 30
+            self._track_widths(widths, [f"• {insight}"])
+        rows.append([])
         
         # Salesperson Summary Table
-        ws[f'A{row + 1}'] = "👥 SALESPERSON PERFORMANCE SUMMARY"
-        ws[f'A{row + 1}'].font = self.title_font
+        rows.append([self._cell(ws, "👥 SALESPERSON PERFORMANCE SUMMARY", font=self.title_font)])
+        rows.append([])
+        self._track_widths(widths, ["👥 SALESPERSON PERFORMANCE SUMMARY"])
         
         # Headers
         headers = ["Salesperson", "Dormant Customers", "Value at Risk", "High Value", "Quick Wins", "Avg Churn Risk"]
-        header_row = row + 3
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=header_row, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = Alignment(horizontal='center')
-            cell.border = self.border
+        self._track_widths(widths, headers)
+        rows.append(self._styled_row(
+            ws, headers, font=self.header_font, fill=self.header_fill, alignment=self.center_align, border=self.border
+        ))
         
         # Data rows
-        for i, summary in enumerate(result.salesperson_summaries, header_row + 1):
+        for summary in result.salesperson_summaries:
             data = [
                 summary.salesperson,
                 summary.dormant_customer_count,
@@ -114,20 +147,20 @@ class ExcelReportGenerator:
                 f"{summary.average_churn_risk:.1%}"
             ]
             
-            for col, value in enumerate(data, 1):
-                cell = ws.cell(row=i, column=col, value=value)
-                cell.border = self.border
-                
-                # Highlight high-risk reps
-                if summary.average_churn_risk > 0.7:
-                    cell.fill = self.warning_fill
-                elif summary.total_value_at_risk > 5000:
-                    cell.fill = self.highlight_fill
+            # Highlight high-risk reps
+            if summary.average_churn_risk > 0.7:
+                fill = self.warning_fill
+            elif summary.total_value_at_risk > 5000:
+                fill = self.highlight_fill
+            else:
+                fill = None
+            
+            rows.append(self._styled_row(ws, data, fill=fill, border=self.border))
+            self._track_widths(widths, data)
+        rows.extend([[], []])
         
         # Data Quality Report
-        quality_row = header_row + len(result.salesperson_summaries) + 3
-        ws[f'A{quality_row}'] = "📋 DATA QUALITY REPORT"
-        ws[f'A{quality_row}'].font = self.title_font
+        rows.append([self._cell(ws, "📋 DATA QUALITY REPORT", font=self.title_font)])
         
         quality_metrics = [
             ("Total Records Processed", result.data_quality_report["total_records"]),
@@ -136,164 +169,178 @@ class ExcelReportGenerator:
             ("Missing Customer Mappings", result.data_quality_report["missing_customer_mappings"])
         ]
         
-        for i, (metric, value) in enumerate(quality_metrics, quality_row + 1):
-            ws[f'A{i}'] = metric
-            ws[f'B{i}'] = value
-            ws[f'A{i}'].font = self.subtitle_font
-        
-        # Auto-fit columns
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        for metric, value in quality_metrics:
+            rows.append([self._cell(ws, metric, font=self.subtitle_font), value])
+            self._track_widths(widths, [metric, value])
+        
+        # Column widths must be set before the first row is streamed
+        self._apply_column_widths(ws, widths)
+        for row in rows:
+            ws.append(row)
     
-    def _create_salesperson_sheets(self, wb: Workbook, result: ProcessingResult):
+    def _create_salesperson_sheets(self, wb: Workbook, result: ProcessingResult, customers_df: pd.DataFrame):
         """Create individual sheets for each salesperson."""
-        # Group customers by salesperson
-        rep_customers = {}
-        for customer in result.dormant_customers:
-            rep = customer.salesperson
-            if rep not in rep_customers:
-                rep_customers[rep] = []
-            rep_customers[rep].append(customer)
-        
-        for rep, customers in rep_customers.items():
+        # Sort once by rep (in order of first appearance), then by descending churn risk
+        rep_order = pd.factorize(customers_df['salesperson'])[0]
+        order = np.lexsort((-customers_df['churn_risk_score'].to_numpy(), rep_order))
+        
+        for rep, customers in customers_df.iloc[order].groupby('salesperson', sort=False):
             # Clean sheet name
             sheet_name = self._clean_sheet_name(f"{rep}_Dormant")
             ws = wb.create_sheet(sheet_name)
             
+            # Formatted columns have fixed widths; the rest are measured as rows are built
+            widths = {2: DATE_WIDTH, 4: CURRENCY_WIDTH, 6: CURRENCY_WIDTH, 7: PERCENT_WIDTH, 8: CURRENCY_WIDTH}
+            
             # Title
-            ws['A1'] = f"Dormant Customers - {rep}"
-            ws['A1'].font = Font(bold=True, size=14, color="2F5597")
+            title = f"Dormant Customers - {rep}"
+            rows = [[self._cell(ws, title, font=self.title_font)], []]
+            self._track_widths(widths, [title])
             
             # Summary for this rep
             summary = next((s for s in result.salesperson_summaries if s.salesperson == rep), None)
             if summary:
-                ws['A3'] = f"Total Dormant Customers: {summary.dormant_customer_count}"
-                ws['A4'] = f"Total Value at Risk: ${summary.total_value_at_risk:,.2f}"
-                ws['A5'] = f"Average Churn Risk: {summary.average_churn_risk:.1%}"
+                for line in [
+                    f"Total Dormant Customers: {summary.dormant_customer_count}",
+                    f"Total Value at Risk: ${summary.total_value_at_risk:,.2f}",
+                    f"Average Churn Risk: {summary.average_churn_risk:.1%}"
+                ]:
+                    rows.append([line])
+                    self._track_widths(widths, [line])
+            else:
+                rows.extend([[], [], []])
+            rows.append([])
             
             # Table headers
             headers = [
                 "Customer", "Last Order Date", "Days Since Order", "6-Month Value",
                 "Order Count", "Avg Order Value", "Churn Risk", "CLV", "Preferred Products"
             ]
+            self._track_widths(widths, headers)
             
-            header_row = 7
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=header_row, column=col, value=header)
-                cell.font = self.header_font
-                cell.fill = self.header_fill
-                cell.alignment = Alignment(horizontal='center')
-                cell.border = self.border
+            rows.append(self._styled_row(
+                ws, headers, font=self.header_font, fill=self.header_fill, alignment=self.center_align, border=self.border
+            ))
             
             # Customer data
-            for i, customer in enumerate(sorted(customers, key=lambda x: x.churn_risk_score, reverse=True), header_row + 1):
+            number_formats = {2: DATE_FORMAT, 4: MONEY_FORMAT, 6: MONEY_FORMAT, 7: PERCENT_FORMAT, 8: MONEY_FORMAT}
+            for i, customer in enumerate(customers.itertuples(index=False)):
                 data = [
                     customer.customer,
-                    customer.last_order_date.strftime('%m/%d/%Y'),
+                    customer.last_order_date,
                     customer.days_since_order,
-                    f"${customer.total_6_month_value:,.2f}",
+                    customer.total_6_month_value,
                     customer.order_count_6_months,
-                    f"${customer.average_order_value:,.2f}",
-                    f"{customer.churn_risk_score:.1%}",
-                    f"${customer.customer_lifetime_value:,.2f}",
+                    customer.average_order_value,
+                    customer.churn_risk_score,
+                    customer.customer_lifetime_value,
                     ", ".join(customer.preferred_products[:3])
                 ]
                 
-                for col, value in enumerate(data, 1):
-                    cell = ws.cell(row=i, column=col, value=value)
-                    cell.border = self.border
-                    
-                    # Color coding by risk
-                    if customer.churn_risk_score > 0.8:
-                        cell.fill = self.warning_fill
-                    elif customer.churn_risk_score > 0.6:
-                        cell.fill = self.highlight_fill
+                # Color coding by risk
+                if customer.churn_risk_score > 0.8:
+                    fill = self.warning_fill
+                elif customer.churn_risk_score > 0.6:
+                    fill = self.highlight_fill
+                else:
+                    fill = None
+                
+                rows.append(self._styled_row(ws, data, number_formats, fill=fill, border=self.border))
+                self._track_widths(widths, data, columns=(1, 3, 5, 9) if i < WIDTH_SAMPLE_ROWS else (1, 9))
             
-            # Auto-fit columns
-            self._auto_fit_columns(ws)
+            self._apply_column_widths(ws, widths)
+            for row in rows:
+                ws.append(row)
     
-    def _create_consolidated_sheet(self, wb: Workbook, result: ProcessingResult):
+    def _create_consolidated_sheet(self, wb: Workbook, result: ProcessingResult, customers_df: pd.DataFrame):
         """Create consolidated view of all dormant customers."""
         ws = wb.create_sheet("All Dormant Customers")
         
+        # Formatted columns have fixed widths; the rest are measured as rows are built
+        widths = {3: DATE_WIDTH, 5: CURRENCY_WIDTH, 6: PERCENT_WIDTH, 7: CURRENCY_WIDTH}
+        
         # Title
-        ws['A1'] = "All Dormant Customers - Consolidated View"
-        ws['A1'].font = Font(bold=True, size=14, color="2F5597")
+        rows = [[self._cell(ws, "All Dormant Customers - Consolidated View", font=self.title_font)], []]
+        self._track_widths(widths, ["All Dormant Customers - Consolidated View"])
         
         # Headers
         headers = [
             "Customer", "Salesperson", "Last Order Date", "Days Since Order",
             "6-Month Value", "Churn Risk", "Customer LTV", "Priority"
         ]
+        self._track_widths(widths, headers)
         
-        header_row = 3
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=header_row, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = Alignment(horizontal='center')
-            cell.border = self.border
+        rows.append(self._styled_row(
+            ws, headers, font=self.header_font, fill=self.header_fill, alignment=self.center_align, border=self.border
+        ))
         
         # Sort customers by value at risk
-        sorted_customers = sorted(result.dormant_customers, key=lambda x: x.total_6_month_value, reverse=True)
-        
-        for i, customer in enumerate(sorted_customers, header_row + 1):
-            # Determine priority
-            if customer.churn_risk_score > 0.8 or customer.total_6_month_value > 2000:
-                priority = "HIGH"
-            elif customer.churn_risk_score > 0.6 or customer.total_6_month_value > 1000:
-                priority = "MEDIUM"
-            else:
-                priority = "LOW"
-            
-            data = [
-                customer.customer,
-                customer.salesperson,
-                customer.last_order_date.strftime('%m/%d/%Y'),
-                customer.days_since_order,
-                f"${customer.total_6_month_value:,.2f}",
-                f"{customer.churn_risk_score:.1%}",
-                f"${customer.customer_lifetime_value:,.2f}",
-                priority
-            ]
-            
-            for col, value in enumerate(data, 1):
-                cell = ws.cell(row=i, column=col, value=value)
-                cell.border = self.border
-                
-                # Color coding
-                if priority == "HIGH":
-                    cell.fill = self.warning_fill
-                elif priority == "MEDIUM":
-                    cell.fill = self.highlight_fill
+        sorted_customers = customers_df.sort_values('total_6_month_value', ascending=False, kind='stable')
+        
+        # Determine priority
+        risk = sorted_customers['churn_risk_score']
+        value = sorted_customers['total_6_month_value']
+        priorities = np.select(
+            [(risk > 0.8) | (value > 2000), (risk > 0.6) | (value > 1000)],
+            ["HIGH", "MEDIUM"],
+            default="LOW"
+        )
         
-        self._auto_fit_columns(ws)
+        # Build the whole table column-wise, then emit it row by row
+        table = pd.DataFrame({
+            "Customer": sorted_customers['customer'],
+            "Salesperson": sorted_customers['salesperson'],
+            "Last Order Date": sorted_customers['last_order_date'],
+            "Days Since Order": sorted_customers['days_since_order'],
+            "6-Month Value": sorted_customers['total_6_month_value'],
+            "Churn Risk": sorted_customers['churn_risk_score'],
+            "Customer LTV": sorted_customers['customer_lifetime_value'],
+            "Priority": priorities
+        })
+        
+        number_formats = {3: DATE_FORMAT, 5: MONEY_FORMAT, 6: PERCENT_FORMAT, 7: MONEY_FORMAT}
+        for data in dataframe_to_rows(table, index=False, header=False):
+            rows.append(self._styled_row(ws, data, number_formats, border=self.border))
+        
+        if not table.empty:
+            # Text columns are measured in full, the days column on the leading rows only
+            measured = {
+                1: table["Customer"],
+                2: table["Salesperson"],
+                4: table["Days Since Order"].head(WIDTH_SAMPLE_ROWS),
+                8: table["Priority"]
+            }
+            for col, values in measured.items():
+                widths[col] = max(widths.get(col, 0), int(values.astype(str).str.len().max()))
+            
+            # Color coding by priority, evaluated by Excel rather than styled per cell
+            first_row, last_row = len(rows) - len(table) + 1, len(rows)
+            cell_range = f"A{first_row}:H{last_row}"
+            ws.conditional_formatting.add(cell_range, FormulaRule(formula=[f'$H{first_row}="HIGH"'], fill=self.warning_fill))
+            ws.conditional_formatting.add(cell_range, FormulaRule(formula=[f'$H{first_row}="MEDIUM"'], fill=self.highlight_fill))
+        
+        self._apply_column_widths(ws, widths)
+        for row in rows:
+            ws.append(row)
     
-    def _create_analytics_dashboard(self, wb: Workbook, result: ProcessingResult):
+    def _create_analytics_dashboard(self, wb: Workbook, result: ProcessingResult, customers_df: pd.DataFrame):
         """Create analytics dashboard with charts."""
         ws = wb.create_sheet("Analytics Dashboard")
         
+        widths = {}
+        
         # Title
-        ws['A1'] = "Analytics Dashboard"
-        ws['A1'].font = Font(bold=True, size=16, color="2F5597")
+        rows = [[self._cell(ws, "Analytics Dashboard", font=self.dashboard_title_font)], []]
         
         # Risk distribution
-        ws['A3'] = "Churn Risk Distribution"
-        ws['A3'].font = self.title_font
+        rows.append([self._cell(ws, "Churn Risk Distribution", font=self.title_font)])
+        self._track_widths(widths, ["Churn Risk Distribution"])
         
         # Calculate risk buckets
-        high_risk = len([c for c in result.dormant_customers if c.churn_risk_score > 0.7])
-        medium_risk = len([c for c in result.dormant_customers if 0.4 <= c.churn_risk_score <= 0.7])
-        low_risk = len([c for c in result.dormant_customers if c.churn_risk_score < 0.4])
+        scores = customers_df['churn_risk_score'].to_numpy(dtype=float)
+        high_risk = int((scores > 0.7).sum())
+        medium_risk = int(((scores >= 0.4) & (scores <= 0.7)).sum())
+        low_risk = int((scores < 0.4).sum())
         
         risk_data = [
             ["Risk Level", "Customer Count"],
@@ -302,33 +349,52 @@ class ExcelReportGenerator:
             ["Low Risk (<40%)", low_risk]
         ]
         
-        for i, row in enumerate(risk_data, 4):
-            for j, value in enumerate(row, 1):
-                cell = ws.cell(row=i, column=j, value=value)
-                if i == 4:  # Header
-                    cell.font = self.header_font
-                    cell.fill = self.header_fill
-                cell.border = self.border
+        for i, row in enumerate(risk_data):
+            self._track_widths(widths, row)
+            if i == 0:  # Header
+                rows.append(self._styled_row(
+                    ws, row, font=self.header_font, fill=self.header_fill, border=self.border
+                ))
+            else:
+                rows.append(self._styled_row(ws, row, border=self.border))
+        rows.extend([[], []])
         
         # Value distribution
-        ws['A10'] = "Value at Risk by Salesperson"
-        ws['A10'].font = self.title_font
-        
-        value_data = [["Salesperson", "Value at Risk"]]
-        for summary in result.salesperson_summaries[:10]:  # Top 10
-            value_data.append([summary.salesperson, float(summary.total_value_at_risk)])
-        
-        for i, row in enumerate(value_data, 11):
-            for j, value in enumerate(row, 1):
-                cell = ws.cell(row=i, column=j, value=value)
-                if i == 11:  # Header
-                    cell.font = self.header_font
-                    cell.fill = self.header_fill
-                if j == 2 and i > 11:  # Format currency
-                    cell.value = f"${value:,.2f}"
-                cell.border = self.border
-        
-        self._auto_fit_columns(ws)
+        rows.append([self._cell(ws, "Value at Risk by Salesperson", font=self.title_font)])
+        self._track_widths(widths, ["Value at Risk by Salesperson"])
+        
+        headers = ["Salesperson", "Value at Risk"]
+        self._track_widths(widths, headers)
+        header_row = len(rows) + 1
+        rows.append(self._styled_row(
+            ws, headers, font=self.header_font, fill=self.header_fill, border=self.border
+        ))
+        
+        top_reps = result.salesperson_summaries[:10]  # Top 10
+        for summary in top_reps:
+            row = [summary.salesperson, float(summary.total_value_at_risk)]
+            rows.append(self._styled_row(ws, row, number_formats={2: MONEY_FORMAT}, border=self.border))
+            self._track_widths(widths, row, columns=[1])
+        widths[2] = max(widths.get(2, 0), CURRENCY_WIDTH)
+        
+        # Bar chart backed by the table above, rendered by Excel
+        if top_reps:
+            last_row = header_row + len(top_reps)
+            chart = BarChart()
+            chart.type = "col"
+            chart.title = "Value at Risk by Salesperson"
+            chart.y_axis.title = "Value at Risk"
+            chart.y_axis.numFmt = MONEY_FORMAT
+            chart.legend = None
+            data = Reference(ws, min_col=2, min_row=header_row, max_row=last_row)
+            cats = Reference(ws, min_col=1, min_row=header_row + 1, max_row=last_row)
+            chart.add_data(data, titles_from_data=True)
+            chart.set_categories(cats)
+            ws.add_chart(chart, f"D{header_row}")
+        
+        self._apply_column_widths(ws, widths)
+        for row in rows:
+            ws.append(row)
     
     def _clean_sheet_name(self, name: str) -> str:
         """Clean sheet name to meet Excel requirements."""
@@ -340,16 +406,51 @@ class ExcelReportGenerator:
         # Limit to 31 characters
         return name[:31]
     
-    def _auto_fit_columns(self, ws):
-        """Auto-fit column widths."""
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
\ No newline at end of file
+    def _cell(self, ws, value, font=None, fill=None, alignment=None, border=None) -> Cell:
+        """Create a pre-styled cell for a write-only worksheet."""
+        cell = WriteOnlyCell(ws, value=value)
+        if font:
+            cell.font = font
+        if fill:
+            cell.fill = fill
+        if alignment:
+            cell.alignment = alignment
+        if border:
+            cell.border = border
+        return cell
+    
+    def _styled_row(self, ws, values: list, number_formats: Optional[Dict[int, str]] = None, **styles) -> List[Cell]:
+        """Create a row of write-only cells that share one precomputed style.
+        
+        ``number_formats`` maps 1-based columns to an Excel number format.
+        """
+        prototype = self._cell(ws, None, **styles)
+        style = copy(prototype._style)
+        column_styles = {}
+        for col, number_format in (number_formats or {}).items():
+            prototype.number_format = number_format
+            column_styles[col] = copy(prototype._style)
+        
+        row = []
+        for col, value in enumerate(values, 1):
+            cell = WriteOnlyCell(ws, value=value)
+            cell._style = copy(column_styles.get(col, style))
+            row.append(cell)
+        return row
+    
+    def _apply_column_widths(self, ws, widths: Dict[int, int]):
+        """Set tracked column widths, capped at 50; no cells are read."""
+        for col, width in widths.items():
+            ws.column_dimensions[get_column_letter(col)].width = min(width + 2, 50)
+    
+    def _track_widths(self, widths: Dict[int, int], values: list, columns=None):
+        """Grow tracked column widths to fit a row of values.
+        
+        Only the given 1-based columns are measured when ``columns`` is set.
+        """
+        for col, value in enumerate(values, 1):
+            if columns is not None and col not in columns:
+                continue
+            length = len(value) if isinstance(value, str) else len(str(value))
+            if length > widths.get(col, 0):
+                widths[col] = length
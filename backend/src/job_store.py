@@ -0,0 +1,110 @@
+import os
+import logging
+from typing import Dict, Any, Optional
+
+from .models import ProcessingResult
+
+try:
+    import orjson
+    import redis.asyncio as aioredis
+except ImportError:  # Optional shared job storage
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+# Completed results outlive the status entries used while polling
+RESULT_TTL_SECONDS = 24 * 60 * 60
+STATUS_TTL_SECONDS = 60 * 60
+
+
+class InMemoryJobStore:
+    """Job status and results held in this process."""
+    
+    def __init__(self):
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._results: Dict[str, ProcessingResult] = {}
+        self._results_json: Dict[str, Dict[str, Any]] = {}
+        self._report_paths: Dict[str, str] = {}
+    
+    async def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._status.get(job_id)
+    
+    async def set_status(self, job_id: str, status: Dict[str, Any]):
+        self._status[job_id] = status
+    
+    async def update_status(self, job_id: str, fields: Dict[str, Any]):
+        self._status[job_id].update(fields)
+    
+    async def set_result(self, job_id: str, result: ProcessingResult, payload: Dict[str, Any]):
+        self._results[job_id] = result
+        self._results_json[job_id] = payload
+    
+    async def get_result(self, job_id: str) -> Optional[ProcessingResult]:
+        return self._results.get(job_id)
+    
+    async def get_result_json(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._results_json.get(job_id)
+    
+    async def set_report_path(self, job_id: str, path: str):
+        self._report_paths[job_id] = path
+    
+    async def get_report_path(self, job_id: str) -> Optional[str]:
+        return self._report_paths.get(job_id)
+
+
+class RedisJobStore:
+    """Job status and results stored in Redis as JSON with a TTL.
+    
+    Only the serialized payload is kept, so completed jobs don't pin
+    result objects in the API process and survive worker restarts.
+    """
+    
+    def __init__(self, url: str):
+        self._redis = aioredis.from_url(url)
+    
+    async def _get_json(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self._redis.get(key)
+        return orjson.loads(raw) if raw is not None else None
+    
+    async def _set_json(self, key: str, value: Dict[str, Any], ttl: int):
+        await self._redis.setex(key, ttl, orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY))
+    
+    async def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._get_json(f"status:{job_id}")
+    
+    async def set_status(self, job_id: str, status: Dict[str, Any]):
+        await self._set_json(f"status:{job_id}", status, STATUS_TTL_SECONDS)
+    
+    async def update_status(self, job_id: str, fields: Dict[str, Any]):
+        # Each job's status is written only by its own background task
+        status = await self.get_status(job_id) or {}
+        status.update(fields)
+        await self.set_status(job_id, status)
+    
+    async def set_result(self, job_id: str, result: ProcessingResult, payload: Dict[str, Any]):
+        await self._set_json(f"result:{job_id}", payload, RESULT_TTL_SECONDS)
+    
+    async def get_result(self, job_id: str) -> Optional[ProcessingResult]:
+        payload = await self.get_result_json(job_id)
+        return ProcessingResult.from_dict(payload) if payload is not None else None
+    
+    async def get_result_json(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._get_json(f"result:{job_id}")
+    
+    async def set_report_path(self, job_id: str, path: str):
+        await self._redis.setex(f"report:{job_id}", RESULT_TTL_SECONDS, path)
+    
+    async def get_report_path(self, job_id: str) -> Optional[str]:
+        path = await self._redis.get(f"report:{job_id}")
+        return path.decode() if path is not None else None
+
+
+def create_job_store():
+    """Use Redis when REDIS_URL is configured, otherwise keep jobs in memory."""
+    redis_url = os.environ.get("REDIS_URL")
+    if redis_url:
+        if aioredis is not None:
+            return RedisJobStore(redis_url)
+        logger.warning("REDIS_URL is set but redis/orjson are not installed; keeping jobs in memory")
+    return InMemoryJobStore()
+
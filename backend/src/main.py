@@ -1,28 +1,45 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 import tempfile
 import os
 import shutil
 import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from typing import Dict, Any, List
 import logging
+import time
 from datetime import datetime, date
 import json
 import uuid
+import aiofiles
 
 from .data_processor import DormantCustomerProcessor, AnalyticsConfig
-from .models import ProcessingResult
+from .models import ProcessingResult, DormantCustomer
 from .excel_generator import ExcelReportGenerator
+from .job_store import create_job_store, RESULT_TTL_SECONDS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run CPU-bound file processing in worker processes for the app's lifetime."""
+    # Spawned workers avoid forking the server's thread pools (polars, numba)
+    app.state.executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+    try:
+        yield
+    finally:
+        app.state.executor.shutdown(wait=False, cancel_futures=True)
+
 app = FastAPI(
     title="Dormant Customer Sales Intelligence API",
     description="Advanced analytics for identifying and analyzing dormant customers",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend integration
@@ -34,9 +51,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage for processing results (use Redis/DB in production)
-processing_results: Dict[str, ProcessingResult] = {}
-processing_status: Dict[str, Dict[str, Any]] = {}
+# Uploads are copied to disk in 1 MiB chunks
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Excel reports are generated once per job and served from here
+REPORTS_DIR = os.environ.get("REPORTS_DIR", os.path.join(tempfile.gettempdir(), "reports"))
+
+# Job status and results (Redis when REDIS_URL is set, otherwise in-memory)
+job_store = create_job_store()
 
 @app.get("/")
 async def root():
@@ -88,7 +110,7 @@ async def upload_files(
     job_id = str(uuid.uuid4())
     
     # Initialize processing status
-    processing_status[job_id] = {
+    await job_store.set_status(job_id, {
         "status": "uploaded",
         "progress": 0,
         "message": "Files uploaded successfully",
@@ -97,18 +119,15 @@ async def upload_files(
             "sales_file": sales_file.filename,
             "planning_file": planning_file.filename
         }
-    }
+    })
     
     # Save uploaded files
     temp_dir = tempfile.mkdtemp()
     sales_path = os.path.join(temp_dir, sales_file.filename)
     planning_path = os.path.join(temp_dir, planning_file.filename)
     
-    with open(sales_path, "wb") as buffer:
-        shutil.copyfileobj(sales_file.file, buffer)
-    
-    with open(planning_path, "wb") as buffer:
-        shutil.copyfileobj(planning_file.file, buffer)
+    await _save_upload(sales_file, sales_path)
+    await _save_upload(planning_file, planning_path)
     
     # Configure analytics
     config = AnalyticsConfig(
@@ -133,6 +152,17 @@ async def upload_files(
         "message": "Files uploaded successfully. Processing started."
     }
 
+async def _save_upload(upload: UploadFile, path: str):
+    """Stream an uploaded file to disk without blocking the event loop."""
+    async with aiofiles.open(path, "wb") as buffer:
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            await buffer.write(chunk)
+
+def _process_files_sync(sales_path: str, planning_path: str, config: AnalyticsConfig) -> ProcessingResult:
+    """Process uploaded files; runs inside a worker process."""
+    processor = DormantCustomerProcessor(config, cache_dir=os.environ.get("SALES_CACHE_DIR"))
+    return processor.process_files(sales_path, planning_path)
+
 async def process_files_background(
     job_id: str, 
     sales_path: str, 
@@ -143,35 +173,46 @@ async def process_files_background(
     """Background task for processing files."""
     try:
         # Update status
-        processing_status[job_id].update({
+        await job_store.update_status(job_id, {
             "status": "processing",
             "progress": 10,
             "message": "Starting data validation..."
         })
         
-        # Initialize processor
-        processor = DormantCustomerProcessor(config)
-        
         # Update status
-        processing_status[job_id].update({
+        await job_store.update_status(job_id, {
             "progress": 30,
             "message": "Validating and cleaning data..."
         })
         
-        # Process files
-        result = processor.process_files(sales_path, planning_path)
+        # Process files in a worker process so the event loop stays responsive
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            app.state.executor, _process_files_sync, sales_path, planning_path, config
+        )
         
         # Update status
-        processing_status[job_id].update({
+        await job_store.update_status(job_id, {
             "progress": 70,
             "message": "Generating insights and analytics..."
         })
         
         # Store result
-        processing_results[job_id] = result
+        await job_store.set_result(job_id, result, _serialize_result(result))
+        
+        # Build the Excel report now so downloads are just a file read
+        await job_store.update_status(job_id, {
+            "progress": 90,
+            "message": "Generating Excel report..."
+        })
+        try:
+            await _generate_excel(job_id, result)
+        except Exception as e:
+            # The download endpoint retries on demand, so the job still succeeds
+            logger.error(f"Excel generation failed for job {job_id}: {str(e)}")
         
         # Update status
-        processing_status[job_id].update({
+        await job_store.update_status(job_id, {
             "status": "completed",
             "progress": 100,
             "message": "Processing completed successfully",
@@ -186,7 +227,7 @@ async def process_files_background(
         
     except Exception as e:
         logger.error(f"Processing failed for job {job_id}: {str(e)}")
-        processing_status[job_id].update({
+        await job_store.update_status(job_id, {
             "status": "failed",
             "progress": 0,
             "message": f"Processing failed: {str(e)}",
@@ -194,111 +235,119 @@ async def process_files_background(
         })
     
     finally:
-        # Cleanup temporary files
-        try:
-            shutil.rmtree(temp_dir)
-        except:
-            pass
+        # Cleanup temporary files off the event loop; status is already final
+        await asyncio.to_thread(shutil.rmtree, temp_dir, ignore_errors=True)
 
 @app.get("/processing-status/{job_id}")
 async def get_processing_status(job_id: str):
     """Get the current processing status for a job."""
-    if job_id not in processing_status:
+    status = await job_store.get_status(job_id)
+    if status is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return processing_status[job_id]
+    return status
 
 @app.get("/results/{job_id}")
 async def get_results(job_id: str):
     """Get processing results for a completed job."""
-    if job_id not in processing_results:
+    payload = await job_store.get_result_json(job_id)
+    if payload is None:
         raise HTTPException(status_code=404, detail="Results not found or processing not completed")
     
-    result = processing_results[job_id]
-    
-    # Convert to JSON-serializable format
-    return {
-        "summary": result.summary,
-        "salesperson_summaries": [summary.__dict__ for summary in result.salesperson_summaries],
-        "dormant_customers": [customer.__dict__ for customer in result.dormant_customers],
-        "insights": result.insights,
-        "data_quality_report": result.data_quality_report,
-        "processing_timestamp": result.processing_timestamp.isoformat(),
-        "total_customers_analyzed": result.total_customers_analyzed,
-        "data_accuracy_score": result.data_accuracy_score
-    }
+    # Already JSON-ready, so skip FastAPI's per-request encoding pass
+    return JSONResponse(content=payload)
 
 @app.post("/generate-excel/{job_id}")
 async def generate_excel_report(job_id: str):
-    """Generate and return Excel report for processed data."""
-    if job_id not in processing_results:
-        raise HTTPException(status_code=404, detail="Results not found")
-    
-    result = processing_results[job_id]
-    
-    # Generate Excel file
-    generator = ExcelReportGenerator()
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
+    """Return the Excel report for processed data, generating it if needed."""
+    excel_path = await job_store.get_report_path(job_id)
     
-    try:
-        excel_path = generator.generate_report(result, temp_file.name)
+    if excel_path is None or not os.path.exists(excel_path):
+        result = await job_store.get_result(job_id)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Results not found")
         
-        return FileResponse(
-            path=excel_path,
-            filename=f"Dormant_Customer_Report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
+        try:
+            excel_path = await _generate_excel(job_id, result)
+        except Exception as e:
+            logger.error(f"Excel generation failed: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Excel generation failed: {str(e)}")
     
-    except Exception as e:
-        logger.error(f"Excel generation failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Excel generation failed: {str(e)}")
+    return FileResponse(
+        path=excel_path,
+        filename=f"Dormant_Customer_Report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+
+async def _generate_excel(job_id: str, result: ProcessingResult) -> str:
+    """Write a job's Excel report in a worker thread and record its path."""
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    await asyncio.to_thread(_sweep_expired_reports)
+    excel_path = await asyncio.to_thread(
+        ExcelReportGenerator().generate_report, result, os.path.join(REPORTS_DIR, f"{job_id}.xlsx")
+    )
+    await job_store.set_report_path(job_id, excel_path)
+    return excel_path
+
+def _sweep_expired_reports() -> None:
+    """Delete reports older than the result TTL; their jobs have expired with them."""
+    cutoff = time.time() - RESULT_TTL_SECONDS
+    with os.scandir(REPORTS_DIR) as entries:
+        for entry in entries:
+            try:
+                if entry.name.endswith(".xlsx") and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+            except OSError as e:  # Another worker may have swept it first
+                logger.debug(f"Could not delete expired report {entry.path}: {str(e)}")
 
 @app.get("/analytics/customer-insights/{job_id}")
 async def get_customer_insights(job_id: str, customer_name: str = None):
     """Get detailed insights for specific customers or all customers."""
-    if job_id not in processing_results:
+    payload = await job_store.get_result_json(job_id)
+    if payload is None:
         raise HTTPException(status_code=404, detail="Results not found")
     
-    result = processing_results[job_id]
-    
     if customer_name:
         # Find specific customer
-        customer = next((c for c in result.dormant_customers if c.customer == customer_name), None)
+        customer = next((c for c in payload["dormant_customers"] if c["customer"] == customer_name), None)
         if not customer:
             raise HTTPException(status_code=404, detail="Customer not found")
         
         return {
-            "customer": customer.__dict__,
-            "recommendations": _generate_customer_recommendations(customer)
+            "customer": customer,
+            "recommendations": _generate_customer_recommendations(DormantCustomer.from_dict(customer))
         }
     else:
         # Return all customers with basic info
         return {
             "customers": [
                 {
-                    "customer": c.customer,
-                    "salesperson": c.salesperson,
-                    "value_at_risk": float(c.total_6_month_value),
-                    "churn_risk": c.churn_risk_score,
-                    "days_since_order": c.days_since_order
+                    "customer": c["customer"],
+                    "salesperson": c["salesperson"],
+                    "value_at_risk": float(c["total_6_month_value"]),
+                    "churn_risk": c["churn_risk_score"],
+                    "days_since_order": c["days_since_order"]
                 }
-                for c in result.dormant_customers
+                for c in payload["dormant_customers"]
             ]
         }
 
 @app.get("/analytics/rep-performance/{job_id}")
 async def get_rep_performance(job_id: str):
     """Get detailed performance analytics by sales rep."""
-    if job_id not in processing_results:
+    payload = await job_store.get_result_json(job_id)
+    if payload is None:
         raise HTTPException(status_code=404, detail="Results not found")
     
-    result = processing_results[job_id]
-    
     return {
-        "rep_summaries": [summary.__dict__ for summary in result.salesperson_summaries],
-        "performance_insights": _generate_rep_performance_insights(result.salesperson_summaries)
+        "rep_summaries": payload["salesperson_summaries"],
+        "performance_insights": _generate_rep_performance_insights(payload["summary"])
     }
 
+def _serialize_result(result: ProcessingResult) -> Dict[str, Any]:
+    """Convert a processing result to the JSON-serializable payload served by the API."""
+    return result.to_json_dict()
+
 def _generate_customer_recommendations(customer) -> List[str]:
     """Generate specific recommendations for a customer."""
     recommendations = []
@@ -317,19 +366,16 @@ def _generate_customer_recommendations(customer) -> List[str]:
     
     return recommendations
 
-def _generate_rep_performance_insights(summaries: List) -> Dict[str, Any]:
-    """Generate performance insights across all reps."""
-    if not summaries:
+def _generate_rep_performance_insights(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Read the rep performance aggregates cached on the result summary."""
+    if "top_performer" not in summary:
         return {}
     
-    total_at_risk = sum(s.total_value_at_risk for s in summaries)
-    avg_customers = sum(s.dormant_customer_count for s in summaries) / len(summaries)
-    
     return {
-        "total_value_at_risk": float(total_at_risk),
-        "average_dormant_customers_per_rep": avg_customers,
-        "top_performer": summaries[0].salesperson if summaries else None,
-        "needs_attention": [s.salesperson for s in summaries if s.average_churn_risk > 0.7][:3]
+        "total_value_at_risk": summary["total_value_at_risk_total"],
+        "average_dormant_customers_per_rep": summary["average_dormant_customers_per_rep"],
+        "top_performer": summary["top_performer"],
+        "needs_attention": summary["needs_attention"]
     }
 
 if __name__ == "__main__":
@@ -1,11 +1,15 @@
 from datetime import datetime, date
+from dataclasses import dataclass, asdict
+from functools import cached_property
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field
 from decimal import Decimal
+import numpy as np
 import pandas as pd
 
 
-class SalesRecord(BaseModel):
+@dataclass(slots=True, frozen=True)
+class SalesRecord:
     """Individual sales transaction record."""
     invoice_number: str
     invoice_date: date
@@ -13,22 +17,30 @@ class SalesRecord(BaseModel):
     customer: str
     salesperson: str
     item: str
-    quantity: int = Field(gt=0)
-    net_price: Decimal = Field(gt=0)
+    quantity: int
+    net_price: Decimal
     supplier: Optional[str] = None
     sku: Optional[str] = None
-
-    @validator('posted_date', 'invoice_date')
-    def validate_dates(cls, v):
-        if isinstance(v, str):
-            return datetime.strptime(v, '%m/%d/%Y').date()
-        return v
-
-    @validator('net_price')
-    def validate_price(cls, v):
-        if isinstance(v, str):
-            return Decimal(v.replace(',', ''))
-        return Decimal(str(v))
+    
+    def __post_init__(self):
+        # Frozen, so normalized values are set through object.__setattr__
+        for name in ('posted_date', 'invoice_date'):
+            value = getattr(self, name)
+            if isinstance(value, str):
+                object.__setattr__(self, name, datetime.strptime(value, '%m/%d/%Y').date())
+        
+        price = self.net_price
+        if isinstance(price, str):
+            price = Decimal(price.replace(',', ''))
+        object.__setattr__(self, 'net_price', Decimal(str(price)))
+        
+        if self.quantity <= 0:
+            raise ValueError("quantity must be greater than 0")
+        if self.net_price <= 0:
+            raise ValueError("net_price must be greater than 0")
+    
+    def dict(self) -> Dict[str, Any]:
+        return asdict(self)
 
 
 class CustomerMapping(BaseModel):
@@ -39,32 +51,56 @@ class CustomerMapping(BaseModel):
     segment: Optional[str] = None
 
 
-class DormantCustomer(BaseModel):
+@dataclass(slots=True, frozen=True)
+class DormantCustomer:
     """Dormant customer with analytics."""
     customer: str
     salesperson: str
     last_order_date: date
     days_since_order: int
-    total_6_month_value: Decimal
+    total_6_month_value: float
     order_count_6_months: int
-    average_order_value: Decimal
-    churn_risk_score: float = Field(ge=0, le=1)
-    customer_lifetime_value: Decimal
+    average_order_value: float
+    churn_risk_score: float
+    customer_lifetime_value: float
     preferred_products: List[str]
     seasonal_pattern: Optional[str] = None
-
-
-class SalespersonSummary(BaseModel):
+    
+    def dict(self) -> Dict[str, Any]:
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DormantCustomer':
+        """Rebuild and validate a serialized customer, where dates are ISO strings.
+        
+        The processor builds instances directly from values it has already
+        typed; this is the checked path for data coming from outside.
+        """
+        if not 0 <= data['churn_risk_score'] <= 1:
+            raise ValueError("churn_risk_score must be between 0 and 1")
+        
+        last_order_date = data['last_order_date']
+        if isinstance(last_order_date, str):
+            last_order_date = date.fromisoformat(last_order_date)
+        return cls(**{**data, 'last_order_date': last_order_date})
+
+
+@dataclass(slots=True, frozen=True)
+class SalespersonSummary:
     """Summary statistics for a salesperson."""
     salesperson: str
     dormant_customer_count: int
-    total_value_at_risk: Decimal
+    total_value_at_risk: float
     high_value_dormant_count: int
     quick_win_count: int
     average_churn_risk: float
+    
+    def dict(self) -> Dict[str, Any]:
+        return asdict(self)
 
 
-class ProcessingResult(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ProcessingResult:
     """Complete processing result with insights."""
     summary: Dict[str, Any]
     salesperson_summaries: List[SalespersonSummary]
@@ -74,6 +110,30 @@ class ProcessingResult(BaseModel):
     processing_timestamp: datetime
     total_customers_analyzed: int
     data_accuracy_score: float
+    
+    def dict(self) -> Dict[str, Any]:
+        return asdict(self)
+    
+    def to_json_dict(self) -> Dict[str, Any]:
+        """Plain-JSON form of the result, with dates as ISO strings."""
+        return asdict(self, dict_factory=_json_dict)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ProcessingResult':
+        """Rebuild from the payload produced by ``to_json_dict``."""
+        timestamp = data['processing_timestamp']
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        return cls(**{
+            **data,
+            'salesperson_summaries': [SalespersonSummary(**s) for s in data['salesperson_summaries']],
+            'dormant_customers': [DormantCustomer.from_dict(c) for c in data['dormant_customers']],
+            'processing_timestamp': timestamp
+        })
+
+
+def _json_dict(items) -> Dict[str, Any]:
+    return {key: value.isoformat() if isinstance(value, date) else value for key, value in items}
 
 
 class DataQualityReport(BaseModel):
@@ -95,4 +155,22 @@ class AnalyticsConfig(BaseModel):
     analysis_period_months: int = 6
     high_value_threshold: Decimal = Decimal('1000')
     quick_win_threshold: Decimal = Decimal('500')
-    min_orders_for_pattern: int = 3
\ No newline at end of file
+    min_orders_for_pattern: int = 3
+    
+    # Frozen so the analysis dates derived below can never go stale
+    model_config = ConfigDict(frozen=True)
+    
+    @cached_property
+    def today_np(self) -> np.datetime64:
+        """today_date as datetime64[ns], for comparisons against date columns."""
+        return np.datetime64(self.today_date, 'ns')
+    
+    @cached_property
+    def analysis_start_np(self) -> np.datetime64:
+        """Orders before this fall outside the analysis period."""
+        return self.today_np - np.timedelta64(self.analysis_period_months * 30, 'D')
+    
+    @cached_property
+    def dormant_cutoff_np(self) -> np.datetime64:
+        """Customers whose last order is before this are dormant."""
+        return self.today_np - np.timedelta64(self.dormant_days_threshold, 'D')
@@ -0,0 +1,54 @@
+"""Pytest plugin failing tests whose guarded block slows down well past its recorded baseline."""
+import os
+import time
+from contextlib import contextmanager
+
+import pytest
+
+# Per-test timings in pytest's cache (.pytest_cache); machine-specific, so never committed
+BASELINE_KEY = "perf_guard/baselines"
+
+# Fail when a block takes more than this multiple of its baseline...
+REGRESSION_FACTOR = 2.0
+# ...and the slowdown is too large to be timer noise
+MIN_REGRESSION_NS = 50_000_000
+
+# Recent timings averaged into each test's baseline; fewer than this are only recorded
+BASELINE_SAMPLES = 5
+
+
+@pytest.fixture
+def perf_guard(request):
+    """Context manager timing a block against this test's rolling-mean baseline.
+    
+    The block runs unchecked under pytest-xdist, where workers compete for CPU,
+    and when the cache plugin is disabled.
+    """
+    cache = request.config.cache if hasattr(request.config, "cache") else None
+    test_id = request.node.nodeid
+    
+    @contextmanager
+    def guard():
+        if cache is None or os.environ.get("PYTEST_XDIST_WORKER"):
+            yield
+            return
+        
+        start = time.perf_counter_ns()
+        yield
+        elapsed = time.perf_counter_ns() - start
+        
+        baselines = cache.get(BASELINE_KEY, {})
+        samples = baselines.get(test_id, [])
+        if len(samples) >= BASELINE_SAMPLES:
+            baseline = sum(samples) / len(samples)
+            if elapsed > baseline * REGRESSION_FACTOR and elapsed - baseline > MIN_REGRESSION_NS:
+                # Leave the baseline alone so a regression can't become the new normal
+                pytest.fail(
+                    f"{test_id} took {elapsed / 1e6:.1f} ms, over "
+                    f"{REGRESSION_FACTOR:g}x its {baseline / 1e6:.1f} ms baseline"
+                )
+        
+        baselines[test_id] = (samples + [elapsed])[-BASELINE_SAMPLES:]
+        cache.set(BASELINE_KEY, baselines)
+    
+    return guard